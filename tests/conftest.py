@@ -0,0 +1,20 @@
+"""
+Shared pytest configuration for the Activities API tests
+"""
+import re
+
+# Tests whose names match this pattern touch (or depend on) the seed
+# participant rosters and need the rollback fixture
+_MUTATING_TEST_PATTERN = re.compile(r"signup|unregister|participants|special_characters")
+
+
+def pytest_collection_modifyitems(items):
+    """Apply the reset_activities fixture to every mutating test.
+
+    Keeps reset_activities non-autouse (read-only tests skip the rollback)
+    without every mutating test having to request it in its signature.
+    """
+    for item in items:
+        if _MUTATING_TEST_PATTERN.search(item.name):
+            if "reset_activities" not in item.fixturenames:
+                item.fixturenames.append("reset_activities")